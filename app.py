@@ -6,6 +6,7 @@ How it works:
 2. Fetches daily & hourly weather forecast from Open-Meteo.
 3. (Optional) Calls Hugging Face text-generation inference API to produce
    a short human-friendly forecast summary. Set HF_API_TOKEN as an env var.
+   Read timeouts can be tuned with OM_READ_TIMEOUT / HF_READ_TIMEOUT (seconds).
 4. Shows results in a Gradio web UI.
 
 Run:
@@ -15,47 +16,196 @@ Run:
 """
 
 import os
-import requests
+import time
+import random
+import hashlib
+import atexit
+import asyncio
 import datetime
-from typing import Tuple, Dict, Any, Optional
+import shutil
+import tempfile
+import warnings
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import AsyncIterator, Tuple, Dict, Any, Optional
+import httpx
+import numpy as np
+import orjson
 import gradio as gr
 
 # -------- Config ----------
 GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
 FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
-HF_INFERENCE_URL = "https://api-inference.huggingface.co/models/"  # append model id
+HF_INFERENCE_URL = "https://api-inference.huggingface.co/pipeline/text2text-generation/"  # append model id
 HF_MODEL = "google/flan-t5-small"  # small model recommended for quick summaries (change if you like)
+_HF_TOKEN = os.environ.get("HF_API_TOKEN")  # read once at import
+GEOCODE_CACHE_SIZE = 512
+FORECAST_CACHE_SIZE = 256
+FORECAST_CACHE_TTL = 3600  # seconds; entries are also keyed on today's date
+CONNECT_TIMEOUT = 3.05  # seconds; a little over a multiple of the 3 s TCP retransmit window
+OM_READ_TIMEOUT = float(os.getenv("OM_READ_TIMEOUT", "8"))
+HF_READ_TIMEOUT = float(os.getenv("HF_READ_TIMEOUT", "30"))
+EXAMPLES = [["Rahim Yar Khan, Pakistan", 7], ["Lahore, Pakistan", 5], ["Islamabad, Pakistan", 3]]
+CONCURRENCY_LIMIT = 8  # concurrent Gradio events
+QUEUE_MAX_SIZE = 64
+HF_MAX_INPUT_CHARS = 1200  # well under flan-t5's 512-token context
+OM_MAX_RETRIES = 2  # Open-Meteo GETs are cheap; fail fast after a couple of tries
+HF_CACHE_SIZE = 256
+DOWNLOAD_TTL = 600  # seconds to keep raw-JSON download files (Gradio copies them into its own cache)
+HF_WARM_INTERVAL = 300  # seconds; skip the warm-up if HF answered successfully this recently
+HF_MAX_RETRIES = 5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+HF_RETRY_BUDGET = 120  # seconds across all attempts of one summarization
 # --------------------------
 
-def geocode_place(place: str) -> Optional[Dict[str, Any]]:
+# -------- Shared HTTP client ----------
+_loads = orjson.loads  # JSON decoder for upstream responses; swap here if needed
+_OM_TIMEOUT = httpx.Timeout(OM_READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+_HF_TIMEOUT = httpx.Timeout(HF_READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+# One keep-alive HTTP/2 client for all upstreams, so repeat clicks skip the TCP/TLS handshake
+# and concurrent requests to the same host share a connection.
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+async def _get_client() -> httpx.AsyncClient:
+    """Return the module-level httpx client, creating it on first use.
+    Construction doesn't await, so no lock is needed on the single event loop."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=_OM_TIMEOUT,
+            # httpx has no per-host cap (aiohttp's limit_per_host) or DNS cache (ttl_dns_cache).
+            # Over HTTP/2 each host gets one multiplexed connection anyway, so the global
+            # max_connections is the effective bound; DNS is resolved once per connection.
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=75),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+    return _CLIENT
+
+async def close_client() -> None:
+    """Close the shared client (safe to call more than once)."""
+    global _CLIENT
+    if _CLIENT is not None and not _CLIENT.is_closed:
+        await _CLIENT.aclose()
+    _CLIENT = None
+
+def _close_client_at_exit() -> None:
+    if _CLIENT is None or _CLIENT.is_closed:
+        return
+    try:
+        asyncio.run(close_client())
+    except Exception:
+        pass  # interpreter is shutting down; nothing useful left to do
+
+atexit.register(_close_client_at_exit)
+# ---------------------------------------
+
+async def _get_with_retry(url: str, params: Dict[str, Any]) -> httpx.Response:
+    """GET with a short exponential backoff on 429/5xx; raises for any other error status."""
+    client = await _get_client()
+    for attempt in range(OM_MAX_RETRIES + 1):
+        r = await client.get(url, params=params)
+        if r.status_code not in RETRY_STATUSES or attempt == OM_MAX_RETRIES:
+            break
+        await asyncio.sleep(0.5 * 2 ** attempt + random.uniform(0, 0.25))
+    r.raise_for_status()
+    return r
+
+async def geocode_place(place: str) -> Optional[Dict[str, Any]]:
     """Return the top geocoding result {name, latitude, longitude, country, timezone} or None."""
     params = {"name": place, "count": 1, "language": "en", "format": "json"}
-    r = requests.get(GEOCODE_URL, params=params, timeout=10)
-    r.raise_for_status()
-    data = r.json()
+    r = await _get_with_retry(GEOCODE_URL, params)
+    data = _loads(r.content)
     if data.get("results"):
         return data["results"][0]
     return None
 
-def fetch_open_meteo(lat: float, lon: float, days: int = 7) -> Dict[str, Any]:
+# Static part of the forecast query; only location and dates vary per call.
+_FC_BASE = MappingProxyType({
+    "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weathercode,sunrise,sunset",
+    "hourly": "temperature_2m,relativehumidity_2m,precipitation,winddirection_10m,windspeed_10m",
+    "timezone": "auto",
+})
+
+async def fetch_open_meteo(lat: float, lon: float, days: int = 7) -> Dict[str, Any]:
     """Fetch daily/hourly forecast from Open-Meteo for the next `days` days."""
     start_date = datetime.date.today()
     end_date = start_date + datetime.timedelta(days=days-1)
     params = {
+        **_FC_BASE,
         "latitude": lat,
         "longitude": lon,
-        "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weathercode,sunrise,sunset",
-        "hourly": "temperature_2m,relativehumidity_2m,precipitation,winddirection_10m,windspeed_10m",
-        "timezone": "auto",
         "start_date": start_date.isoformat(),
         "end_date": end_date.isoformat(),
     }
-    r = requests.get(FORECAST_URL, params=params, timeout=15)
-    r.raise_for_status()
-    return r.json()
+    r = await _get_with_retry(FORECAST_URL, params)
+    return _loads(r.content)
+
+# -------- In-process caches ----------
+_GEO_CACHE: "OrderedDict[str, Optional[Dict[str, Any]]]" = OrderedDict()
+_FC_CACHE: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
+_HF_CACHE: "OrderedDict[str, str]" = OrderedDict()  # sha256(model + prompt) -> summary
 
-def format_forecast_text(place_name: str, forecast_json: Dict[str, Any]) -> str:
-    """Create a plain-language summary from the Open-Meteo daily forecast data."""
+async def geocode_cached(place: str) -> Optional[Dict[str, Any]]:
+    """LRU-cached geocode_place, keyed on the normalized place string."""
+    key = place.strip().lower()
+    if key in _GEO_CACHE:
+        _GEO_CACHE.move_to_end(key)
+        return _GEO_CACHE[key]
+    geo = await geocode_place(place)
+    _GEO_CACHE[key] = geo
+    if len(_GEO_CACHE) > GEOCODE_CACHE_SIZE:
+        _GEO_CACHE.popitem(last=False)
+    return geo
+
+async def fetch_open_meteo_cached(lat: float, lon: float, days: int = 7) -> Dict[str, Any]:
+    """fetch_open_meteo with a per-day TTL cache. The returned dict is shared; don't mutate it."""
+    key = (round(lat, 3), round(lon, 3), days, datetime.date.today().isoformat())
+    now = time.monotonic()
+    hit = _FC_CACHE.get(key)
+    if hit is not None and now - hit[0] < FORECAST_CACHE_TTL:
+        return hit[1]
+    forecast = await fetch_open_meteo(lat, lon, days=days)
+    _FC_CACHE.pop(key, None)  # re-insert so dict order stays oldest-first
+    _FC_CACHE[key] = (now, forecast)
+    while len(_FC_CACHE) > FORECAST_CACHE_SIZE:
+        del _FC_CACHE[next(iter(_FC_CACHE))]
+    return forecast
+# -------------------------------------
+
+_WDAY = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MON = (None, "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+def _fmt_date(d: str) -> str:
+    """'2024-05-03' -> 'Fri 03 May'."""
+    dt = datetime.date.fromisoformat(d)
+    return f"{_WDAY[dt.weekday()]} {dt.day:02d} {_MON[dt.month]}"
+
+_HOURLY_VARS = ("temperature_2m", "relativehumidity_2m", "precipitation", "winddirection_10m", "windspeed_10m")
+
+def _hourly_to_np(forecast_json: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Hourly series as float32 arrays shaped (days, 24); empty dict if they don't fit that shape."""
+    hourly = forecast_json.get("hourly", {})
+    try:
+        return {k: np.asarray(hourly[k], dtype=np.float32).reshape(-1, 24) for k in _HOURLY_VARS}
+    except (KeyError, ValueError, TypeError):
+        return {}
+
+def _hourly_note(wind_max: float, humidity: float) -> str:
+    """' Wind up to X km/h, humidity ~Y%.' from a day's stats, leaving out NaN values."""
+    parts = []
+    if not np.isnan(wind_max):
+        parts.append(f"Wind up to {wind_max:.0f} km/h")
+    if not np.isnan(humidity):
+        parts.append(f"humidity ~{humidity:.0f}%")
+    if not parts:
+        return ""
+    note = ", ".join(parts)
+    return f" {note[0].upper()}{note[1:]}."
+
+def format_forecast_text(place_name: str, forecast_json: Dict[str, Any], compact: bool = False) -> str:
+    """Create a plain-language summary from the Open-Meteo daily (and hourly) forecast data.
+    With compact=True, emit only 'day: weather lo–hi' lines (smaller HF prompt)."""
     daily = forecast_json.get("daily", {})
     dates = daily.get("time", [])
     tmax = daily.get("temperature_2m_max", [])
@@ -63,76 +213,223 @@ def format_forecast_text(place_name: str, forecast_json: Dict[str, Any]) -> str:
     precip = daily.get("precipitation_sum", [])
     weathercodes = daily.get("weathercode", [])
 
-    lines = [f"Weather forecast for {place_name}:\n"]
-    for d, hi, lo, p, wc in zip(dates, tmax, tmin, precip, weathercodes):
-        date = datetime.datetime.fromisoformat(d).strftime("%a %d %b")
-        precip_note = "no significant rain" if (p is None or p == 0) else f"{p} mm precipitation expected"
-        # Basic interpretation of weathercode (simple)
-        wc_note = _weathercode_to_text(wc)
-        lines.append(f"{date}: {wc_note}. Temp {int(lo)}°C–{int(hi)}°C, {precip_note}.")
-    return "\n".join(lines)
+    if compact:
+        body = "\n".join(
+            f"{_fmt_date(d)}: {_weathercode_to_text(wc)} {int(lo)}–{int(hi)}°C"
+            for d, hi, lo, wc in zip(dates, tmax, tmin, weathercodes)
+        )
+    else:
+        hourly = _hourly_to_np(forecast_json)
+        if hourly and len(hourly["windspeed_10m"]) == len(dates):
+            # days whose hourly values are all null come out as NaN; don't warn, just skip them below
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                wind_max = np.nanmax(hourly["windspeed_10m"], axis=1)
+                humidity = np.nanmean(hourly["relativehumidity_2m"], axis=1)
+            extras = [_hourly_note(w, h) for w, h in zip(wind_max, humidity)]
+        else:
+            extras = [""] * len(dates)
+        body = "\n".join(
+            f"{_fmt_date(d)}: {_weathercode_to_text(wc)}. Temp {int(lo)}°C–{int(hi)}°C, "
+            f"{'no significant rain' if not p else f'{p} mm precipitation expected'}.{x}"
+            for d, hi, lo, p, wc, x in zip(dates, tmax, tmin, precip, weathercodes, extras)
+        )
+    return f"Weather forecast for {place_name}:\n\n{body}"
+
+# Very small mapping for Open-Meteo weathercode to text, built once at import.
+_CODE_MAP: Dict[int, str] = {0: "Clear sky"}
+for _codes, _text in (
+    ((1, 2, 3), "Mainly clear to partly cloudy"),
+    ((45, 48), "Fog or depositing rime fog"),
+    ((51, 53, 55), "Drizzle"),
+    ((61, 63, 65), "Rain"),
+    ((71, 73, 75), "Snow"),
+    ((95, 96, 99), "Thunderstorms"),
+):
+    for _c in _codes:
+        _CODE_MAP[_c] = _text
+del _codes, _text, _c
 
 def _weathercode_to_text(code: int) -> str:
     """Very small mapping for Open-Meteo weathercode to text."""
-    if code in (0,):
-        return "Clear sky"
-    if code in (1,2,3):
-        return "Mainly clear to partly cloudy"
-    if code in (45,48):
-        return "Fog or depositing rime fog"
-    if code in (51,53,55):
-        return "Drizzle"
-    if code in (61,63,65):
-        return "Rain"
-    if code in (71,73,75):
-        return "Snow"
-    if code in (95,96,99):
-        return "Thunderstorms"
-    return "Mixed/unknown weather"
-
-def hf_summarize(text: str, model: str = HF_MODEL, hf_token: Optional[str] = None, max_length: int = 200) -> str:
+    return _CODE_MAP.get(code, "Mixed/unknown weather")
+
+_HF_LAST_OK: Optional[float] = None  # monotonic time of the last successful HF response
+
+def _ran_model(r: httpx.Response) -> bool:
+    """True if this HF reply was computed by the model rather than served from HF's response cache."""
+    return r.is_success and r.headers.get("x-compute-type") != "cache"
+
+def _mark_hf_ok() -> None:
+    global _HF_LAST_OK
+    _HF_LAST_OK = time.monotonic()
+
+def _hf_needs_warmup() -> bool:
+    """True unless HF answered successfully within HF_WARM_INTERVAL (the model is then likely loaded)."""
+    return _HF_LAST_OK is None or time.monotonic() - _HF_LAST_OK > HF_WARM_INTERVAL
+
+async def _hf_post(url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Any:
+    """POST to the HF inference API, retrying cold starts and transient errors with jittered backoff."""
+    client = await _get_client()
+    deadline = time.monotonic() + HF_RETRY_BUDGET
+    for attempt in range(HF_MAX_RETRIES + 1):
+        # no single attempt may run past the overall budget
+        remaining = max(deadline - time.monotonic(), 0.1)
+        timeout = httpx.Timeout(min(HF_READ_TIMEOUT, remaining), connect=min(CONNECT_TIMEOUT, remaining))
+        try:
+            r = await client.post(url, headers=headers, json=payload, timeout=timeout)
+        except httpx.TimeoutException:
+            # with wait_for_model the server holds the request while loading; a fresh
+            # attempt picks the model up once it is ready
+            if attempt == HF_MAX_RETRIES or time.monotonic() >= deadline:
+                raise
+            continue
+        if r.status_code not in RETRY_STATUSES or attempt == HF_MAX_RETRIES:
+            r.raise_for_status()
+            if _ran_model(r):  # a reply from HF's cache (use_cache) says nothing about the model being loaded
+                _mark_hf_ok()
+            return _loads(r.content)
+        wait = random.uniform(2, 4) * (attempt + 1)
+        if r.status_code == 503:
+            # a loading model answers {"error": ..., "estimated_time": seconds}; honour it
+            # (capped at 20 s) but never wait less than the jittered backoff
+            try:
+                wait = max(min(float(_loads(r.content)["estimated_time"]), 20), wait)
+            except (ValueError, KeyError, TypeError):
+                pass
+        if time.monotonic() + wait > deadline:
+            r.raise_for_status()
+        await asyncio.sleep(wait)
+
+def _hf_prompt_and_key(text: str, model: str) -> Tuple[str, str]:
+    """The HF prompt for `text` and its summary-cache key."""
+    prompt = f"Summarize the following weather report in a short, user-friendly paragraph:\n\n{text[:HF_MAX_INPUT_CHARS]}"
+    return prompt, hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+
+def _hf_cache_get(key: str) -> Optional[str]:
+    """LRU lookup in _HF_CACHE; None on a miss."""
+    if key not in _HF_CACHE:
+        return None
+    _HF_CACHE.move_to_end(key)
+    return _HF_CACHE[key]
+
+def hf_cached_summary(text: str, model: str = HF_MODEL) -> Optional[str]:
+    """The cached summary for `text`, or None if hf_summarize hasn't produced one yet."""
+    return _hf_cache_get(_hf_prompt_and_key(text, model)[1])
+
+class HFSummarizationError(Exception):
+    """hf_summarize couldn't produce a summary; the message is user-facing."""
+
+async def hf_summarize(text: str, model: str = HF_MODEL, hf_token: Optional[str] = _HF_TOKEN, max_length: int = 200) -> str:
     """Call HF inference API text2text-generation to summarize/rewritten text.
-    Requires HF_API_TOKEN in env or passed as hf_token. Returns generated text or original on failure."""
-    token = hf_token or os.environ.get("HF_API_TOKEN")
-    if not token:
-        return "(Hugging Face token not provided; summarization skipped)\n\n" + text[:2000]
+    Uses HF_API_TOKEN (read at import) unless hf_token is passed. Returns the generated text;
+    raises HFSummarizationError on failure so callers can keep showing their own text."""
+    if not hf_token:
+        raise HFSummarizationError("Hugging Face token not provided; summarization skipped")
+
+    prompt, key = _hf_prompt_and_key(text, model)
+    cached = _hf_cache_get(key)
+    if cached is not None:
+        return cached
 
     url = HF_INFERENCE_URL + model
-    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+    headers = {"Authorization": f"Bearer {hf_token}", "Accept": "application/json"}
     payload = {
-        "inputs": f"Summarize the following weather report in a short, user-friendly paragraph:\n\n{text}",
-        "parameters": {"max_new_tokens": 120, "temperature": 0.1},
+        "inputs": prompt,
+        # greedy decoding keeps output deterministic, so both caches stay valid
+        "parameters": {"max_new_tokens": 120, "do_sample": False},
+        # queue server-side while the model loads instead of failing with 503
+        "options": {"wait_for_model": True, "use_cache": True},
     }
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=60)
-        r.raise_for_status()
-        data = r.json()
-        # the inference API may return a list or object; handle both common cases
-        if isinstance(data, list) and len(data) and "generated_text" in data[0]:
-            return data[0]["generated_text"].strip()
-        if isinstance(data, dict) and "generated_text" in data:
-            return data["generated_text"].strip()
-        # sometimes models return text directly
-        if isinstance(data, str):
-            return data.strip()
-        return "(Summarization produced unexpected output) " + str(data)[:1000]
+        data = await _hf_post(url, headers, payload)
+    except httpx.TimeoutException as e:
+        raise HFSummarizationError("Hugging Face is responding slowly; try again in a moment") from e
     except Exception as e:
-        return f"(Hugging Face summarization failed: {e})\n\n" + text[:2000]
+        raise HFSummarizationError(f"Hugging Face summarization failed: {e}") from e
+
+    # the inference API may return a list or object; handle both common cases
+    if isinstance(data, list) and len(data) and "generated_text" in data[0]:
+        summary = data[0]["generated_text"].strip()
+    elif isinstance(data, dict) and "generated_text" in data:
+        summary = data["generated_text"].strip()
+    # sometimes models return text directly
+    elif isinstance(data, str):
+        summary = data.strip()
+    else:
+        raise HFSummarizationError("Summarization produced unexpected output: " + str(data)[:1000])
+    _HF_CACHE[key] = summary
+    if len(_HF_CACHE) > HF_CACHE_SIZE:
+        _HF_CACHE.popitem(last=False)
+    return summary
+
+async def hf_warmup(model: str = HF_MODEL, hf_token: Optional[str] = _HF_TOKEN) -> None:
+    """Send a tiny request so a cold HF model starts loading. Best effort; errors are ignored."""
+    if not hf_token:
+        return
+    url = HF_INFERENCE_URL + model
+    headers = {"Authorization": f"Bearer {hf_token}", "Accept": "application/json"}
+    # use_cache=False so HF can't answer from its response cache without touching the model
+    payload = {"inputs": "hi", "parameters": {"max_new_tokens": 1}, "options": {"use_cache": False}}
+    try:
+        client = await _get_client()
+        r = await client.post(url, headers=headers, json=payload, timeout=_HF_TIMEOUT)
+        if _ran_model(r):
+            _mark_hf_ok()
+    except Exception:
+        pass  # the real summarization call reports any failure
 
 # -------- Gradio interface logic --------
-def get_forecast_for_place(place: str, days: int = 7, use_hf: bool = True) -> Tuple[str, Dict[str, Any]]:
+async def get_forecast_for_place(place: str, days: int = 7,
+                                 use_hf: bool = True) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (summary, forecast JSON). With HF enabled, the plain-text summary is yielded
+    straight away and the model's summary follows once it arrives."""
     place = place.strip()
     if not place:
-        return "Please enter a location (e.g., 'Rahim Yar Khan, Pakistan').", {}
+        yield "Please enter a location (e.g., 'Rahim Yar Khan, Pakistan').", {}
+        return
+
+    # Wake the HF model now so its cold start overlaps geocode + forecast,
+    # unless a recent success says it is already loaded.
+    warm_task = asyncio.create_task(hf_warmup()) if use_hf and _HF_TOKEN and _hf_needs_warmup() else None
+    try:
+        raw_text_summary, forecast, name = await _lookup_forecast(place, days)
+        if not forecast or not use_hf:
+            yield raw_text_summary, forecast
+        elif not _HF_TOKEN:
+            yield "(HF token not set — set HF_API_TOKEN to enable model summarization)\n\n" + raw_text_summary, forecast
+        else:
+            # Show the deterministic text first; HF summarization is off the critical path.
+            hf_input = format_forecast_text(name, forecast, compact=True)
+            cached = hf_cached_summary(hf_input)
+            if cached is not None:
+                yield cached, forecast  # the finally below cancels any pending warm-up
+                return
+            yield raw_text_summary, forecast
+            if warm_task is not None:
+                await warm_task
+            try:
+                yield await hf_summarize(hf_input), forecast
+            except HFSummarizationError as e:
+                # keep the full forecast on screen; just say why there is no model summary
+                yield f"({e})\n\n" + raw_text_summary, forecast
+    finally:
+        if warm_task is not None and not warm_task.done():
+            warm_task.cancel()
 
+async def _lookup_forecast(place: str, days: int) -> Tuple[str, Dict[str, Any], str]:
+    """Geocode + forecast. Returns (plain-text summary, forecast, place name), or
+    (error message, {}, "") on failure."""
     # 1) Geocode
     try:
-        geo = geocode_place(place)
+        geo = await geocode_cached(place)
+    except httpx.TimeoutException:
+        return "Geocoding service is responding slowly; please try again.", {}, ""
     except Exception as e:
-        return f"Error during geocoding: {e}", {}
+        return f"Error during geocoding: {e}", {}, ""
 
     if not geo:
-        return f"Location not found: {place}", {}
+        return f"Location not found: {place}", {}, ""
 
     name = f"{geo.get('name')}, {geo.get('country')}"
     lat = geo.get("latitude")
@@ -140,50 +437,80 @@ def get_forecast_for_place(place: str, days: int = 7, use_hf: bool = True) -> Tu
 
     # 2) Fetch forecast
     try:
-        forecast = fetch_open_meteo(lat, lon, days=int(days))
+        forecast = await fetch_open_meteo_cached(lat, lon, days=days)
+    except httpx.TimeoutException:
+        return f"Forecast service is responding slowly for {name}; please try again.", {}, ""
     except Exception as e:
-        return f"Error fetching forecast for {name}: {e}", {}
+        return f"Error fetching forecast for {name}: {e}", {}, ""
 
     # 3) Build plain text summary
-    raw_text_summary = format_forecast_text(name, forecast)
-
-    # 4) (Optional) Hugging Face summarization
-    hf_token = os.environ.get("HF_API_TOKEN")
-    if use_hf and hf_token:
-        summary = hf_summarize(raw_text_summary, hf_token=hf_token)
-    elif use_hf and not hf_token:
-        summary = "(HF token not set — set HF_API_TOKEN to enable model summarization)\n\n" + raw_text_summary
-    else:
-        summary = raw_text_summary
+    return format_forecast_text(name, forecast), forecast, name
+
+def display_json(forecast: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of the forecast worth rendering in the browser (drops the bulky hourly arrays)."""
+    return {k: forecast[k] for k in ("latitude", "longitude", "timezone", "daily") if k in forecast}
 
-    # Return: friendly summary and raw JSON (so UI can let user view raw data)
-    return summary, forecast
+# Raw-JSON downloads go to one app-owned directory, pruned on each write and removed at exit.
+_DOWNLOAD_DIR = tempfile.mkdtemp(prefix="weather_forecast_")
+atexit.register(shutil.rmtree, _DOWNLOAD_DIR, ignore_errors=True)
+
+def _prune_downloads() -> None:
+    cutoff = time.time() - DOWNLOAD_TTL
+    for entry in os.scandir(_DOWNLOAD_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass  # already gone
+
+def write_raw_json(forecast: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Dump the full forecast to a .json file for download; None when there is nothing to save."""
+    if not forecast:
+        return None
+    _prune_downloads()
+    with tempfile.NamedTemporaryFile("wb", prefix="forecast_", suffix=".json", dir=_DOWNLOAD_DIR, delete=False) as f:
+        f.write(orjson.dumps(forecast, option=orjson.OPT_INDENT_2))
+    return f.name
+
+async def warmup_examples() -> None:
+    """Pre-geocode the example places concurrently so the first example click skips the geocoder."""
+    await asyncio.gather(*(geocode_cached(place) for place, _ in EXAMPLES), return_exceptions=True)
 
 # -------- Gradio UI --------
 with gr.Blocks(theme=gr.themes.Default()) as demo:
     gr.Markdown("## Pakistan Region Weather Forecast — Gradio + Hugging Face\nEnter a city/region in Pakistan (eg. `Rahim Yar Khan, Pakistan`) and select days.")
     with gr.Row():
         place_in = gr.Textbox(label="City / Region", placeholder="e.g., Rahim Yar Khan, Pakistan", lines=1)
-        days_in = gr.Slider(minimum=1, maximum=14, step=1, value=7, label="Days of forecast")
+        days_in = gr.Slider(minimum=1, maximum=14, step=1, precision=0, value=7, label="Days of forecast")
     hf_checkbox = gr.Checkbox(value=True, label="Enable Hugging Face summary (requires HF_API_TOKEN env var)")
     get_btn = gr.Button("Get Forecast")
 
     with gr.Row():
         summary_out = gr.Textbox(label="Forecast Summary (human-friendly)", lines=8)
-        raw_out = gr.JSON(label="Raw Forecast JSON")
+        raw_out = gr.JSON(label="Raw Forecast JSON (daily)")
+    raw_state = gr.State()  # full Open-Meteo payload, including hourly data
+    with gr.Row():
+        download_btn = gr.Button("Download full raw JSON")
+        raw_file = gr.File(label="Full forecast JSON")
 
     examples = gr.Examples(
-        examples=[["Rahim Yar Khan, Pakistan", 7], ["Lahore, Pakistan", 5], ["Islamabad, Pakistan", 3]],
+        examples=EXAMPLES,
         inputs=[place_in, days_in],
     )
 
-    def _action(place, days, use_hf_flag):
-        text, raw = get_forecast_for_place(place, days, use_hf_flag)
-        return text, raw
+    async def _action(place: str, days: int, use_hf_flag: bool):
+        async for text, raw in get_forecast_for_place(place, days, use_hf_flag):
+            yield text, display_json(raw), raw
 
-    get_btn.click(_action, inputs=[place_in, days_in, hf_checkbox], outputs=[summary_out, raw_out])
+    get_btn.click(_action, inputs=[place_in, days_in, hf_checkbox], outputs=[summary_out, raw_out, raw_state],
+                  concurrency_limit=CONCURRENCY_LIMIT)
+    download_btn.click(write_raw_json, inputs=raw_state, outputs=raw_file)
+    demo.load(warmup_examples, inputs=None, outputs=None)
 
     gr.Markdown("**Notes:**\n- Open-Meteo is used for actual meteorological data (no API key required).\n- To enable better natural-language summaries, export your Hugging Face token: `export HF_API_TOKEN='hf_...'`.\n- Change `HF_MODEL` near the top to try different HF models (beware larger models -> slower / costlier).")
 
+# Async handlers overlap their upstream waits, so let several clicks run at once.
+demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT, max_size=QUEUE_MAX_SIZE)
+
 if __name__ == "__main__":
     demo.launch()